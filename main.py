@@ -1,16 +1,25 @@
+import asyncio
 import base64
-import json
-import re
-from dataclasses import dataclass, asdict
-from typing import Dict, List, Optional
-from urllib.parse import urljoin
-
+import binascii
+import queue
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Set
+from urllib.parse import urljoin, urlsplit
+
+import httpx
+import orjson
 import requests
-from bs4 import BeautifulSoup
+from lxml import etree
+from lxml import html as lxml_html
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from selectolax.lexbor import LexborHTMLParser, LexborNode
 
 # --- Selenium для работы с динамическими тестами ---
 from selenium import webdriver
-from selenium.common.exceptions import TimeoutException
+from selenium.common.exceptions import TimeoutException, WebDriverException
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.common.by import By
@@ -18,9 +27,65 @@ from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.support.ui import WebDriverWait
 from webdriver_manager.chrome import ChromeDriverManager
 
+# RE2 (google-re2) scans in linear time without backtracking; fall back
+# to the standard library engine when it is not installed.
+try:
+    import re2 as quiz_re
+except ImportError:
+    import re as quiz_re
+
 
 BASE_CATEGORY_URL = "https://info-master.uz/category/informatika-2/"
 
+# One shared session so test pages reuse the same keep-alive connection
+# instead of paying a TCP + TLS handshake per request.
+SESSION = requests.Session()
+SESSION.mount(
+    "https://",
+    HTTPAdapter(
+        pool_connections=4,
+        pool_maxsize=16,
+        max_retries=Retry(total=3, backoff_factor=0.3),
+    ),
+)
+SESSION.headers["Accept-Encoding"] = "gzip, deflate, br"
+
+# How many category pages to request at once while looking for the last one.
+CATEGORY_PREFETCH = 4
+
+
+def _xp_class(name: str) -> str:
+    """XPath-условие "у элемента есть CSS-класс name" (аналог .name в CSS)."""
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+
+
+def _lxml_document(html: str) -> Optional[lxml_html.HtmlElement]:
+    """
+    Parse a page with lxml.html, or return None if lxml rejects it.
+
+    The page is passed as UTF-8 bytes with an explicit parser encoding:
+    lxml refuses str input that carries an <?xml encoding=...?> declaration.
+    Documents with no elements at all (empty, comment-only) raise
+    ParserError. A fresh parser per call keeps this safe in worker threads.
+    """
+    parser = lxml_html.HTMLParser(encoding="utf-8")
+    try:
+        return lxml_html.document_fromstring(html.encode("utf-8"), parser=parser)
+    except (etree.ParserError, ValueError):
+        return None
+
+
+# Each test title block: <h2 class="font130 mt0 mb10 mobfont120 lineheight25"><a href="...">...</a></h2>
+XP_TEST_LINK = etree.XPath(
+    "//h2[{}]//a/@href".format(
+        " and ".join(
+            _xp_class(c) for c in ("font130", "mt0", "mb10", "mobfont120", "lineheight25")
+        )
+    ),
+    smart_strings=False,
+)
+XP_NEXT_PAGE = etree.XPath("//a[contains(., 'Keyingi sahifa')]")
+
 
 @dataclass
 class AnswerOption:
@@ -48,18 +113,49 @@ class Test:
     url: str
     questions: List[Question]
 
+    def to_columnar(self) -> Dict[str, Any]:
+        """
+        Представление теста в виде параллельных списков (по списку на поле).
+
+        i-й элемент каждого списка относится к i-му вопросу.
+        """
+        questions = self.questions
+        return {
+            "title": self.title,
+            "url": self.url,
+            "texts": [q.text for q in questions],
+            "images": [q.images for q in questions],
+            "option_texts": [[o.text for o in q.options] for q in questions],
+            "option_correct": [[o.is_correct for o in q.options] for q in questions],
+            "option_images": [[o.images for o in q.options] for q in questions],
+        }
+
 
 # ===== HTTP (статичные страницы) =====
 
 
 def fetch_html(url: str) -> str:
     """Download raw HTML of a page."""
-    resp = requests.get(url, timeout=20)
+    resp = SESSION.get(url, timeout=20)
+    resp.raise_for_status()
+    # Without a charset in Content-Type requests falls back to ISO-8859-1,
+    # but the site is served in UTF-8.
+    if "charset" not in resp.headers.get("Content-Type", ""):
+        resp.encoding = "utf-8"
+    return resp.text
+
+
+def _category_page_url(page: int) -> str:
+    return BASE_CATEGORY_URL if page == 1 else f"{BASE_CATEGORY_URL}page/{page}/"
+
+
+async def _fetch_category_page(client: httpx.AsyncClient, page: int) -> str:
+    resp = await client.get(_category_page_url(page))
     resp.raise_for_status()
     return resp.text
 
 
-def get_test_links() -> List[str]:
+async def get_test_links() -> List[str]:
     """
     Collect all test URLs from the Informatika category.
 
@@ -67,51 +163,121 @@ def get_test_links() -> List[str]:
     with CSS classes:
       font130 mt0 mb10 mobfont120 lineheight25
     We select <h2> with these classes and then grab the inner <a href>.
+
+    The last page number is unknown up front, so pages are fetched
+    speculatively in batches of CATEGORY_PREFETCH and processed in order
+    until one of them has no "Keyingi sahifa" (Next page) link.
     """
     links: List[str] = []
+    seen: Set[str] = set()
     page = 1
 
-    while True:
-        url = BASE_CATEGORY_URL if page == 1 else f"{BASE_CATEGORY_URL}page/{page}/"
-        html = fetch_html(url)
-        soup = BeautifulSoup(html, "html.parser")
+    # HTTP/2 multiplexes the whole batch over a single TLS connection.
+    async with httpx.AsyncClient(
+        http2=True,
+        timeout=20,
+        limits=httpx.Limits(max_connections=8),
+        follow_redirects=True,
+    ) as client:
+        while True:
+            batch = range(page, page + CATEGORY_PREFETCH)
+            # Pages past the real last one usually answer 404, so errors are
+            # only raised once we actually reach that page below.
+            bodies = await asyncio.gather(
+                *(_fetch_category_page(client, p) for p in batch),
+                return_exceptions=True,
+            )
 
-        # Each test title block: <h2 class="font130 mt0 mb10 mobfont120 lineheight25"><a href="...">...</a></h2>
-        for h2 in soup.select("h2.font130.mt0.mb10.mobfont120.lineheight25 a"):
-            href = h2.get("href")
-            if href and href not in links:
-                links.append(href)
+            for html in bodies:
+                if isinstance(html, BaseException):
+                    raise html
+                tree = _lxml_document(html)
+                # A page lxml cannot parse has no links and no next page.
+                if tree is None:
+                    return links
 
-        # Pagination: if there is no "Keyingi sahifa" (Next page) link, stop.
-        has_next = soup.find("a", string=lambda s: s and "Keyingi sahifa" in s)
-        if not has_next:
-            break
+                for href in XP_TEST_LINK(tree):
+                    if href and href not in seen:
+                        seen.add(href)
+                        links.append(href)
 
-        page += 1
+                # Pagination: if there is no "Keyingi sahifa" (Next page) link, stop.
+                if not XP_NEXT_PAGE(tree):
+                    return links
 
-    return links
+            page += CATEGORY_PREFETCH
 
 
-QUIZ_OPTIONS_RE = re.compile(
-    r"window\.quizOptions_\d+\s*\[\s*'(\d+)'\s*\]\s*=\s*'([^']+)'"
+QUIZ_OPTIONS_MARKER = "window.quizOptions_"
+QUIZ_OPTIONS_RE = quiz_re.compile(
+    rb"window\.quizOptions_\d+\s*\[\s*'(\d+)'\s*\]\s*=\s*'([^']+)'"
 )
 
 
 # ===== Selenium (динамические тесты) =====
 
+# Сколько браузеров держим одновременно. Почти всё время каждый из них
+# ждёт загрузки страницы, поэтому потоков достаточно.
+DRIVER_POOL_SIZE = 4
+
+# Ресурсы, которые браузеру не нужно скачивать для разбора викторины
+BLOCKED_URLS = [
+    "*.png", "*.jpg", "*.jpeg", "*.webp", "*.gif", "*.svg",
+    "*.woff", "*.woff2", "*.ttf", "*.css",
+]
+
+
+_DRIVER_PATH: Optional[str] = None
+
+
 def build_driver() -> webdriver.Chrome:
     """Создать headless Chrome с помощью webdriver_manager."""
+    global _DRIVER_PATH
+
     options = Options()
     options.add_argument("--headless=new")
     options.add_argument("--no-sandbox")
     options.add_argument("--disable-dev-shm-usage")
-
-    service = Service(ChromeDriverManager().install())
+    # Картинки и стили нам не нужны: ссылки на картинки берём из src
+    options.add_experimental_option(
+        "prefs",
+        {
+            "profile.managed_default_content_settings.images": 2,
+            "profile.managed_default_content_settings.stylesheets": 2,
+        },
+    )
+    # Блоки .step и window.quizOptions_XXXX есть уже к DOMContentLoaded
+    options.page_load_strategy = "eager"
+
+    # Путь к chromedriver резолвим один раз на процесс, а не на каждый driver пула
+    if _DRIVER_PATH is None:
+        _DRIVER_PATH = ChromeDriverManager().install()
+
+    service = Service(_DRIVER_PATH)
     driver = webdriver.Chrome(service=service, options=options)
     driver.set_page_load_timeout(30)
+    # Шрифты prefs не отключают — режем их (и остальное) на уровне сети
+    driver.execute_cdp_cmd("Network.enable", {})
+    driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": BLOCKED_URLS})
     return driver
 
 
+def _quiz_options_window(html: str) -> bytes:
+    """
+    Кусок страницы от первого до последнего упоминания window.quizOptions_.
+
+    Регулярку гоняем только по нему, а не по всему HTML. Возвращаем bytes,
+    чтобы base64 и orjson работали без лишних перекодировок.
+    """
+    start = html.find(QUIZ_OPTIONS_MARKER)
+    if start == -1:
+        return b""
+    last = html.rfind(QUIZ_OPTIONS_MARKER)
+    end = html.find(";", last)
+    window = html[start:] if end == -1 else html[start:end + 1]
+    return window.encode("utf-8")
+
+
 def _extract_quiz_options(html: str) -> Dict[str, Dict]:
     """
     Вытаскиваем объект window.quizOptions_XXXX по каждому question-id.
@@ -120,169 +286,556 @@ def _extract_quiz_options(html: str) -> Dict[str, Dict]:
         window.quizOptions_1851['52455'] = 'base64(...json...)';
     """
     result: Dict[str, Dict] = {}
-    for qid, b64 in QUIZ_OPTIONS_RE.findall(html):
+    for qid, b64 in QUIZ_OPTIONS_RE.findall(_quiz_options_window(html)):
         try:
-            decoded = base64.b64decode(b64).decode("utf-8")
-            data = json.loads(decoded)
-        except Exception:
+            data = orjson.loads(base64.b64decode(b64))
+        except (ValueError, binascii.Error):
             continue
-        result[qid] = data
+        if isinstance(data, dict):
+            result[qid.decode("ascii")] = data
     return result
 
 
-def _parse_quiz_from_html(url: str, html: str) -> Test:
+def _url_resolver(url: str) -> Callable[[str], str]:
     """
-    Парсинг HTML викторины Quiz Maker БЕЗ кликов по вариантам.
+    Замена urljoin(url, src) для картинок одной страницы.
 
-    Мы читаем:
-      - все блоки .step[data-question-id]
-      - текст вопроса из .ays_quiz_question
-      - текст вариантов из .ays-quiz-answers
-      - правильные ответы берём из window.quizOptions_XXXX
+    Абсолютные и корневые (/wp-content/...) ссылки собираем простой
+    конкатенацией с заранее посчитанным origin; urljoin вызываем только
+    для относительных путей.
     """
-    soup = BeautifulSoup(html, "html.parser")
+    parts = urlsplit(url)
+    origin = f"{parts.scheme}://{parts.netloc}"
 
-    # Заголовок теста
-    title_el = soup.find("h1")
-    title = title_el.get_text(strip=True) if title_el else url
+    def resolve(src: str) -> str:
+        if src.startswith(("http:", "https:")):
+            return src
+        if src.startswith("//"):
+            return f"{parts.scheme}:{src}"
+        if src.startswith("/"):
+            return origin + src
+        return urljoin(url, src)
 
-    quiz_options = _extract_quiz_options(html)
+    return resolve
+
+
+@dataclass
+class _RawAnswer:
+    """Вариант ответа в том виде, в каком он лежит в разметке шага."""
+    answer_id: str
+    text: str
+    images: List[str]
 
-    questions: List[Question] = []
 
-    for step in soup.select("div.step[data-question-id]"):
-        qid = step.get("data-question-id")
-        cfg = quiz_options.get(qid, {})
-        q_type = cfg.get("question_type") or step.get("data-type") or "radio"
-
-        # Текст вопроса
-        q_block = step.select_one(".ays_quiz_question")
-        if q_block:
-            q_text = q_block.get_text(" ", strip=True)
-        else:
-            q_text = ""
-
-        # Картинки, прикреплённые к вопросу (например, схема, рисунок и т.п.)
-        question_images: List[str] = []
-        if q_block:
-            for img_el in q_block.select("img"):
-                src = img_el.get("src")
-                if src:
-                    question_images.append(urljoin(url, src))
-
-        options: List[AnswerOption] = []
-
-        # Радио / чекбокс – обычные варианты
-        if q_type in ("radio", "checkbox"):
-            correct_map: Dict[str, str] = cfg.get("question_answer", {})
-
-            for field in step.select(".ays-quiz-answers .ays-field"):
-                input_el = field.select_one("input[id^='ays-answer-']")
-                if not input_el:
-                    continue
-
-                answer_id = input_el.get("value") or ""
-                input_id = input_el.get("id") or ""
-
-                label_el = field.select_one(f"label[for='{input_id}']")
-                text = ""
-                img_urls: List[str] = []
-                if label_el:
-                    # Берём только текст, без вложенных label для картинок
-                    text = label_el.get_text(" ", strip=True)
-                    # Ищем все <img> внутри этого label (варианты с картинками)
-                    for img_el in label_el.select("img"):
-                        src = img_el.get("src")
-                        if src:
-                            img_urls.append(urljoin(url, src))
-
-                is_correct = False
-                if correct_map:
-                    val = str(correct_map.get(answer_id, "0")).lower()
-                    is_correct = val in ("1", "true")
-
-                options.append(
-                    AnswerOption(
-                        text=text,
-                        is_correct=is_correct,
-                        images=img_urls,
-                    )
+@dataclass
+class _RawStep:
+    """Сырые данные одного блока .step до сопоставления с quizOptions."""
+    qid: str
+    data_type: Optional[str]
+    text: str
+    images: List[str]
+    # Варианты radio / checkbox
+    answers: List[_RawAnswer]
+    # Пары matching: text — левая часть, answer_id — data-answer-id правой
+    matches: List[_RawAnswer]
+
+
+def _lexbor_text(node: LexborNode, sep: str = " ") -> str:
+    """Текст узла как у get_text(sep, strip=True): куски без пробелов по краям."""
+    parts = (
+        (child.text_content or "").strip()
+        for child in node.traverse(include_text=True)
+        if child.tag == "-text"
+    )
+    return sep.join(part for part in parts if part)
+
+
+def _lexbor_images(resolve: Callable[[str], str], node: LexborNode) -> List[str]:
+    """Абсолютные URL всех <img> внутри узла selectolax."""
+    images: List[str] = []
+    for img_el in node.css("img"):
+        src = img_el.attributes.get("src")
+        if src:
+            images.append(resolve(src))
+    return images
+
+
+def _steps_from_lexbor(
+    resolve: Callable[[str], str], tree: LexborHTMLParser
+) -> List[_RawStep]:
+    """Основной путь: вытащить шаги викторины через selectolax (Lexbor)."""
+    steps: List[_RawStep] = []
+
+    for step in tree.css("div.step[data-question-id]"):
+        q_block = step.css_first(".ays_quiz_question")
+        q_text = _lexbor_text(q_block) if q_block else ""
+        question_images = _lexbor_images(resolve, q_block) if q_block else []
+
+        # Все label шага индексируем за один проход вместо поиска
+        # label[for='...'] заново для каждого варианта
+        labels: Dict[str, LexborNode] = {}
+        for label in step.css("label[for]"):
+            labels.setdefault(label.attributes.get("for") or "", label)
+
+        answers: List[_RawAnswer] = []
+        for field in step.css(".ays-quiz-answers .ays-field"):
+            input_el = field.css_first("input[id^='ays-answer-']")
+            if input_el is None:
+                continue
+
+            label_el = labels.get(input_el.attributes.get("id") or "")
+            answers.append(
+                _RawAnswer(
+                    answer_id=input_el.attributes.get("value") or "",
+                    text=_lexbor_text(label_el) if label_el else "",
+                    images=_lexbor_images(resolve, label_el) if label_el else [],
                 )
+            )
 
-        # Короткий текстовый ответ — кладём правильный ответ как единственный вариант
-        elif q_type == "short_text":
-            ans = cfg.get("question_answer", "")
-            if ans:
-                options.append(
-                    AnswerOption(
-                        text=str(ans),
-                        is_correct=True,
-                        images=[],
-                    )
+        matches: List[_RawAnswer] = []
+        for opt in step.css(".ays-matching-field .ays-matching-field-option"):
+            choice_el = opt.css_first(".ays-matching-field-choice")
+            match_el = opt.css_first(".ays-matching-field-match")
+            if choice_el is None or match_el is None:
+                continue
+            matches.append(
+                _RawAnswer(
+                    answer_id=match_el.attributes.get("data-answer-id") or "",
+                    text=_lexbor_text(choice_el),
+                    images=_lexbor_images(resolve, choice_el),
                 )
+            )
+
+        steps.append(
+            _RawStep(
+                qid=step.attributes.get("data-question-id") or "",
+                data_type=step.attributes.get("data-type"),
+                text=q_text,
+                images=question_images,
+                answers=answers,
+                matches=matches,
+            )
+        )
 
-        # Соответствие (matching) — собираем пары "текст -> номер"
-        elif q_type == "matching":
-            # question_answer: {позиция: answer_id}
-            ans_map: Dict[str, str] = cfg.get("question_answer", {})
-            # строим обратное: answer_id -> позиция
-            inv_ans_map: Dict[str, str] = {
-                v: k for k, v in ans_map.items()
-            }
-
-            for opt in step.select(".ays-matching-field .ays-matching-field-option"):
-                choice_el = opt.select_one(".ays-matching-field-choice")
-                match_el = opt.select_one(".ays-matching-field-match")
-                if not choice_el or not match_el:
-                    continue
-                choice_text = choice_el.get_text(" ", strip=True)
-                img_urls: List[str] = []
-                for img_el in choice_el.select("img"):
-                    src = img_el.get("src")
-                    if src:
-                        img_urls.append(urljoin(url, src))
-
-                answer_id = match_el.get("data-answer-id", "")
-                pos = inv_ans_map.get(answer_id)
-                # Сохраняем как "текст -> номер" и помечаем как корректное соответствие
-                if pos is not None:
-                    text = f"{choice_text} -> {pos}"
-                else:
-                    text = choice_text
-                options.append(
-                    AnswerOption(
-                        text=text,
-                        is_correct=True,
-                        images=img_urls,
-                    )
+    return steps
+
+
+# XPath-выражения для запасного пути через lxml компилируем один раз
+XP_STEP = etree.XPath(f"//div[{_xp_class('step')} and @data-question-id]")
+XP_QUESTION = etree.XPath(f"(.//*[{_xp_class('ays_quiz_question')}])[1]")
+XP_LABEL = etree.XPath(".//label[@for]")
+XP_FIELD = etree.XPath(
+    f".//*[{_xp_class('ays-quiz-answers')}]//*[{_xp_class('ays-field')}]"
+)
+XP_INPUT = etree.XPath("(.//input[starts-with(@id, 'ays-answer-')])[1]")
+# Пары matching достаём двумя запросами на весь шаг: для каждого варианта,
+# у которого есть и левая, и правая часть, берём первую из них. Оба списка
+# идут в порядке документа, поэтому их можно склеить через zip().
+_XP_MATCH_OPTION = (
+    f".//*[{_xp_class('ays-matching-field')}]"
+    f"//*[{_xp_class('ays-matching-field-option')}]"
+    f"[descendant::*[{_xp_class('ays-matching-field-choice')}]"
+    f" and descendant::*[{_xp_class('ays-matching-field-match')}]]"
+)
+XP_MATCH_CHOICES = etree.XPath(
+    f"{_XP_MATCH_OPTION}/descendant::*[{_xp_class('ays-matching-field-choice')}][1]"
+)
+XP_MATCH_TARGETS = etree.XPath(
+    f"{_XP_MATCH_OPTION}/descendant::*[{_xp_class('ays-matching-field-match')}][1]"
+)
+XP_IMG_SRC = etree.XPath(".//img/@src", smart_strings=False)
+XP_TEXT = etree.XPath(".//text()", smart_strings=False)
+
+
+def _lxml_text(el: lxml_html.HtmlElement, sep: str = " ") -> str:
+    """Текст элемента как у get_text(sep, strip=True): куски без пробелов по краям."""
+    return sep.join(s for s in (t.strip() for t in XP_TEXT(el)) if s)
+
+
+def _lxml_images(resolve: Callable[[str], str], el: lxml_html.HtmlElement) -> List[str]:
+    """Абсолютные URL всех <img> внутри элемента lxml."""
+    return [resolve(src) for src in XP_IMG_SRC(el) if src]
+
+
+def _steps_from_lxml(
+    resolve: Callable[[str], str], tree: lxml_html.HtmlElement
+) -> List[_RawStep]:
+    """Запасной путь через lxml, если selectolax не нашёл шагов."""
+    steps: List[_RawStep] = []
+
+    for step in XP_STEP(tree):
+        q_found = XP_QUESTION(step)
+        q_block = q_found[0] if q_found else None
+        q_text = _lxml_text(q_block) if q_block is not None else ""
+        question_images = _lxml_images(resolve, q_block) if q_block is not None else []
+
+        labels: Dict[str, lxml_html.HtmlElement] = {}
+        for label in XP_LABEL(step):
+            labels.setdefault(label.get("for") or "", label)
+
+        answers: List[_RawAnswer] = []
+        for field in XP_FIELD(step):
+            input_found = XP_INPUT(field)
+            if not input_found:
+                continue
+            input_el = input_found[0]
+
+            label_el = labels.get(input_el.get("id") or "")
+            answers.append(
+                _RawAnswer(
+                    answer_id=input_el.get("value") or "",
+                    text=_lxml_text(label_el) if label_el is not None else "",
+                    images=_lxml_images(resolve, label_el) if label_el is not None else [],
                 )
+            )
 
-        # Собираем variants и индексы правильных ответов
-        variants = [opt.text for opt in options]
-        correct_idx = [i for i, opt in enumerate(options) if opt.is_correct]
+        matches = [
+            _RawAnswer(
+                answer_id=match_el.get("data-answer-id", ""),
+                text=_lxml_text(choice_el),
+                images=_lxml_images(resolve, choice_el),
+            )
+            for choice_el, match_el in zip(
+                XP_MATCH_CHOICES(step), XP_MATCH_TARGETS(step)
+            )
+        ]
 
-        questions.append(
-            Question(
+        steps.append(
+            _RawStep(
+                qid=step.get("data-question-id"),
+                data_type=step.get("data-type"),
                 text=q_text,
-                options=options,
-                variants=variants,
-                correct_answer=correct_idx,
                 images=question_images,
+                answers=answers,
+                matches=matches,
             )
         )
 
+    return steps
+
+
+def _build_question(step: _RawStep, cfg: Dict[str, Any]) -> Question:
+    """Собрать Question из сырого шага и его записи в window.quizOptions_XXXX."""
+    q_type: str = str(cfg.get("question_type") or step.data_type or "radio")
+
+    options: List[AnswerOption] = []
+
+    # Радио / чекбокс – обычные варианты
+    if q_type in ("radio", "checkbox"):
+        # PHP json_encode отдаёт пустой массив как [], а не {}
+        raw_correct: Any = cfg.get("question_answer")
+        correct_map: Dict[str, Any] = (
+            raw_correct if isinstance(raw_correct, dict) else {}
+        )
+
+        for answer in step.answers:
+            is_correct: bool = False
+            if correct_map:
+                val: str = str(correct_map.get(answer.answer_id, "0")).lower()
+                is_correct = val in ("1", "true")
+
+            options.append(
+                AnswerOption(
+                    text=answer.text,
+                    is_correct=is_correct,
+                    images=answer.images,
+                )
+            )
+
+    # Короткий текстовый ответ — кладём правильный ответ как единственный вариант
+    elif q_type == "short_text":
+        ans = cfg.get("question_answer", "")
+        if ans:
+            options.append(
+                AnswerOption(
+                    text=str(ans),
+                    is_correct=True,
+                    images=[],
+                )
+            )
+
+    # Соответствие (matching) — собираем пары "текст -> номер"
+    elif q_type == "matching":
+        # question_answer: {позиция: answer_id}
+        raw_ans: Any = cfg.get("question_answer")
+        ans_map: Dict[str, Any] = raw_ans if isinstance(raw_ans, dict) else {}
+        # строим обратное: answer_id -> позиция
+        inv_ans_map: Dict[Any, str] = {
+            v: k for k, v in ans_map.items()
+        }
+
+        for match in step.matches:
+            pos: Optional[str] = inv_ans_map.get(match.answer_id)
+            # Сохраняем как "текст -> номер" и помечаем как корректное соответствие
+            text: str
+            if pos is not None:
+                text = f"{match.text} -> {pos}"
+            else:
+                text = match.text
+            options.append(
+                AnswerOption(
+                    text=text,
+                    is_correct=True,
+                    images=match.images,
+                )
+            )
+
+    # Собираем variants и индексы правильных ответов
+    variants: List[str] = [opt.text for opt in options]
+    correct_idx: List[int] = [i for i, opt in enumerate(options) if opt.is_correct]
+
+    return Question(
+        text=step.text,
+        options=options,
+        variants=variants,
+        correct_answer=correct_idx,
+        images=step.images,
+    )
+
+
+def _parse_quiz_from_html(
+    url: str, html: str, quiz_options: Optional[Dict[str, Dict]] = None
+) -> Test:
+    """
+    Парсинг HTML викторины Quiz Maker БЕЗ кликов по вариантам.
+
+    Мы читаем:
+      - все блоки .step[data-question-id]
+      - текст вопроса из .ays_quiz_question
+      - текст вариантов из .ays-quiz-answers
+      - правильные ответы берём из window.quizOptions_XXXX
+
+    Разметку разбираем через selectolax (Lexbor); lxml используется
+    только если selectolax не нашёл ни одного шага. Уже извлечённые
+    quiz_options можно передать, чтобы не искать их в HTML повторно.
+    """
+    tree = LexborHTMLParser(html)
+    resolve = _url_resolver(url)
+    steps = _steps_from_lexbor(resolve, tree)
+    title_el = tree.css_first("h1")
+    title = title_el.text(strip=True) if title_el else url
+
+    # Без data-question-id шагов нет ни для какого парсера — страницу
+    # без викторины второй раз не разбираем
+    if not steps and "data-question-id" in html:
+        document = _lxml_document(html)
+        if document is not None:
+            steps = _steps_from_lxml(resolve, document)
+
+    if quiz_options is None:
+        quiz_options = _extract_quiz_options(html)
+
+    questions = [
+        _build_question(step, quiz_options.get(step.qid, {}))
+        for step in steps
+    ]
+
     return Test(title=title, url=url, questions=questions)
 
 
-def parse_test_page_dynamic(url: str, driver: webdriver.Chrome) -> Test:
+def _parse_complete_quiz(url: str, html: str) -> Optional[Test]:
+    """
+    Распарсить HTML, только если викторина в нём целиком.
+
+    Нужны строки window.quizOptions_XXXX, которые декодируются, и хотя бы
+    один разобранный вопрос; иначе возвращаем None.
+    """
+    if QUIZ_OPTIONS_MARKER not in html or "data-question-id" not in html:
+        return None
+
+    # Опции ищем один раз и отдаём в разбор; без них тест не распарсить
+    quiz_options = _extract_quiz_options(html)
+    if not quiz_options:
+        return None
+
+    test = _parse_quiz_from_html(url, html, quiz_options)
+    return test if test.questions else None
+
+
+def parse_test_page_static(url: str) -> Optional[Test]:
+    """
+    Попробовать распарсить тест без браузера.
+
+    Quiz Maker обычно отдаёт блоки .step и строки window.quizOptions_XXXX
+    прямо в HTML страницы, поэтому хватает одного GET через SESSION.
+    Если викторины в ответе нет (или страница не скачалась) — возвращаем
+    None, и страницу нужно открыть через Selenium.
+    """
+    try:
+        html = fetch_html(url)
+    except requests.RequestException:
+        return None
+
+    return _parse_complete_quiz(url, html)
+
+
+# Скрипт, который собирает данные викторины прямо в браузере и отдаёт их
+# одним JSON-ответом: без сериализации всего DOM в page_source, повторного
+# разбора HTML и поиска base64-строк регуляркой. Структура шагов совпадает
+# с _RawStep / _RawAnswer.
+EXTRACT_QUIZ_JS = r"""
+const text = (el, sep) => {
+  const parts = [];
+  const walker = document.createTreeWalker(el, NodeFilter.SHOW_TEXT);
+  while (walker.nextNode()) {
+    const t = walker.currentNode.nodeValue.trim();
+    if (t) parts.push(t);
+  }
+  return parts.join(sep);
+};
+const images = (el) =>
+  Array.from(el.querySelectorAll("img"), (img) => img.getAttribute("src")).filter(Boolean);
+const decode = (value) => {
+  if (typeof value !== "string") return value;
+  const bytes = Uint8Array.from(atob(value), (c) => c.charCodeAt(0));
+  return JSON.parse(new TextDecoder().decode(bytes));
+};
+
+const options = {};
+for (const key of Object.keys(window)) {
+  const group = key.startsWith("quizOptions_") ? window[key] : null;
+  if (!group || typeof group !== "object") continue;
+  for (const [qid, value] of Object.entries(group)) {
+    try {
+      options[qid] = decode(value);
+    } catch (e) {}
+  }
+}
+
+const steps = Array.from(document.querySelectorAll("div.step[data-question-id]"), (step) => {
+  const question = step.querySelector(".ays_quiz_question");
+  const labels = new Map();
+  for (const label of step.querySelectorAll("label[for]")) {
+    const target = label.getAttribute("for");
+    if (!labels.has(target)) labels.set(target, label);
+  }
+
+  const answers = [];
+  for (const field of step.querySelectorAll(".ays-quiz-answers .ays-field")) {
+    const input = field.querySelector("input[id^='ays-answer-']");
+    if (!input) continue;
+    const label = labels.get(input.getAttribute("id") || "");
+    answers.push({
+      answer_id: input.getAttribute("value") || "",
+      text: label ? text(label, " ") : "",
+      images: label ? images(label) : [],
+    });
+  }
+
+  const matches = [];
+  for (const opt of step.querySelectorAll(".ays-matching-field .ays-matching-field-option")) {
+    const choice = opt.querySelector(".ays-matching-field-choice");
+    const match = opt.querySelector(".ays-matching-field-match");
+    if (!choice || !match) continue;
+    matches.push({
+      answer_id: match.getAttribute("data-answer-id") || "",
+      text: text(choice, " "),
+      images: images(choice),
+    });
+  }
+
+  return {
+    qid: step.getAttribute("data-question-id"),
+    data_type: step.getAttribute("data-type"),
+    text: question ? text(question, " ") : "",
+    images: question ? images(question) : [],
+    answers: answers,
+    matches: matches,
+  };
+});
+
+const h1 = document.querySelector("h1");
+return {title: h1 ? text(h1, "") : null, options: options, steps: steps};
+"""
+
+
+def _test_from_js(url: str, data: Dict[str, Any]) -> Test:
+    """Собрать Test из результата EXTRACT_QUIZ_JS."""
+    resolve = _url_resolver(url)
+
+    def raw_answer(answer: Dict[str, Any]) -> _RawAnswer:
+        return _RawAnswer(
+            answer_id=answer["answer_id"],
+            text=answer["text"],
+            images=[resolve(src) for src in answer["images"]],
+        )
+
+    quiz_options: Dict[str, Dict] = {
+        qid: cfg for qid, cfg in data["options"].items() if isinstance(cfg, dict)
+    }
+    questions: List[Question] = []
+    for step in data["steps"]:
+        raw_step = _RawStep(
+            qid=step["qid"],
+            data_type=step["data_type"],
+            text=step["text"],
+            images=[resolve(src) for src in step["images"]],
+            answers=[raw_answer(a) for a in step["answers"]],
+            matches=[raw_answer(m) for m in step["matches"]],
+        )
+        questions.append(
+            _build_question(raw_step, quiz_options.get(raw_step.qid, {}))
+        )
+
+    return Test(title=data["title"] or url, url=url, questions=questions)
+
+
+def _parse_document_body(url: str, driver: webdriver.Chrome) -> Optional[Test]:
+    """
+    Распарсить тело документа, которое браузер уже скачал.
+
+    Тело берём через CDP (Page.getResourceContent): это не требует
+    сериализации живого DOM, как driver.page_source. Page.captureSnapshot
+    не подходит — в MHTML-снимок не попадают <script>, а вместе с ними и
+    window.quizOptions_XXXX. Принимаем тело по тем же правилам, что и
+    статический путь; иначе (или если CDP недоступен) возвращаем None.
+    """
+    try:
+        frame = driver.execute_cdp_cmd("Page.getFrameTree", {})["frameTree"]["frame"]
+        resource = driver.execute_cdp_cmd(
+            "Page.getResourceContent",
+            {"frameId": frame["id"], "url": frame["url"]},
+        )
+    except (WebDriverException, KeyError):
+        return None
+
+    html = resource.get("content", "")
+    if resource.get("base64Encoded"):
+        html = base64.b64decode(html).decode("utf-8", "replace")
+    return _parse_complete_quiz(url, html)
+
+
+def _parse_loaded_page(
+    url: str, driver: webdriver.Chrome, use_document_body: bool
+) -> Test:
+    """
+    Разобрать открытую страницу по HTML.
+
+    Сначала пробуем скачанное тело документа (если use_document_body),
+    затем живой DOM из driver.page_source.
+    """
+    if use_document_body:
+        test = _parse_document_body(url, driver)
+        if test is not None:
+            return test
+    return _parse_quiz_from_html(url, driver.page_source)
+
+
+def parse_test_page_dynamic(
+    url: str, driver: webdriver.Chrome, use_document_body: bool = True
+) -> Test:
     """
     Парсинг одной страницы теста через Selenium.
 
     Для Quiz Maker на info-master.uz достаточно:
       1. Открыть страницу.
       2. Дождаться появления контейнера викторины.
-      3. Взять driver.page_source и распарсить всё через BeautifulSoup +
-         window.quizOptions_XXXX (без кликов по вариантам).
+      3. Собрать шаги и window.quizOptions_XXXX прямо в странице через
+         EXTRACT_QUIZ_JS (без кликов по вариантам).
+
+    Если скрипт ничего не нашёл, разбираем HTML страницы
+    (_parse_loaded_page). use_document_body=False сразу берёт
+    driver.page_source — когда то же тело уже отверг статический путь.
     """
     driver.get(url)
     wait = WebDriverWait(driver, 20)
@@ -295,37 +848,100 @@ def parse_test_page_dynamic(url: str, driver: webdriver.Chrome) -> Test:
         )
     except TimeoutException:
         # Викторина не прогрузилась
-        html = driver.page_source
-        return _parse_quiz_from_html(url, html)
+        return _parse_loaded_page(url, driver, use_document_body)
 
-    html = driver.page_source
-    return _parse_quiz_from_html(url, html)
+    try:
+        data = driver.execute_script(EXTRACT_QUIZ_JS)
+    except WebDriverException:
+        data = None
+    if data and data["steps"] and data["options"]:
+        return _test_from_js(url, data)
 
+    return _parse_loaded_page(url, driver, use_document_body)
 
-def main() -> None:
-    # 1) Get all test URLs from Informatika category
-    test_links = get_test_links()
-    print(f"Found {len(test_links)} tests.")
 
-    all_tests: List[Test] = []
+def parse_tests_dynamic(
+    links: List[str], use_document_body: bool = True
+) -> List[Test]:
+    """
+    Распарсить страницы тестов пулом из DRIVER_POOL_SIZE браузеров.
 
-    driver = build_driver()
-    try:
-        for link in test_links:
+    Каждый поток берёт свободный driver из очереди и возвращает его
+    обратно после страницы. Порядок результатов совпадает с links.
+    use_document_body передаётся в parse_test_page_dynamic.
+    """
+    if not links:
+        return []
+
+    pool: List[webdriver.Chrome] = []
+    drivers: "queue.Queue[webdriver.Chrome]" = queue.Queue()
+
+    def parse_one(link: str) -> Test:
+        driver = drivers.get()
+        try:
             print(f"Parsing test (dynamic): {link}")
-            test = parse_test_page_dynamic(link, driver)
-            all_tests.append(test)
+            return parse_test_page_dynamic(link, driver, use_document_body)
+        finally:
+            drivers.put(driver)
+
+    try:
+        for _ in range(min(DRIVER_POOL_SIZE, len(links))):
+            driver = build_driver()
+            pool.append(driver)
+            drivers.put(driver)
+
+        with ThreadPoolExecutor(max_workers=len(pool)) as executor:
+            return list(executor.map(parse_one, links))
     finally:
-        driver.quit()
+        for driver in pool:
+            driver.quit()
+
+
+def main(columnar: bool = False) -> None:
+    try:
+        # 1) Get all test URLs from Informatika category
+        test_links = asyncio.run(get_test_links())
+        print(f"Found {len(test_links)} tests.")
 
-    # 2) Save everything to JSON
-    data = [asdict(t) for t in all_tests]
-    with open("tests.json", "w", encoding="utf-8") as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
+        # 2) Try plain HTTP first: the quiz is usually in the static HTML
+        static_tests: List[Optional[Test]] = []
+        for link in test_links:
+            print(f"Parsing test (static): {link}")
+            static_tests.append(parse_test_page_static(link))
+
+        # 3) Only pages without the quiz in their HTML need a browser.
+        # Their raw HTML was already rejected above, so the browser goes
+        # straight to the rendered DOM.
+        dynamic_links = [
+            link for link, test in zip(test_links, static_tests) if test is None
+        ]
+        dynamic_tests = iter(
+            parse_tests_dynamic(dynamic_links, use_document_body=False)
+        )
+        all_tests = [
+            test if test is not None else next(dynamic_tests)
+            for test in static_tests
+        ]
+    finally:
+        SESSION.close()
+
+    # 4) Save everything to JSON
+    json_options = orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS
+    if columnar:
+        # Parallel lists per test instead of nested question objects
+        path = "tests_columnar.json"
+        payload = orjson.dumps(
+            [t.to_columnar() for t in all_tests], option=json_options
+        )
+    else:
+        # orjson serializes the dataclasses natively, no asdict() copy needed
+        path = "tests.json"
+        payload = orjson.dumps(all_tests, option=json_options)
+    with open(path, "wb") as f:
+        f.write(payload)
 
-    print("Saved parsed tests to tests.json")
+    print(f"Saved parsed tests to {path}")
 
 
 if __name__ == "__main__":
-    main()
-
+    main(columnar="--columnar" in sys.argv[1:])
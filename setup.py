@@ -0,0 +1,18 @@
+"""
+Optional native build of the parser with mypyc.
+
+    pip install mypy
+    python setup.py build_ext --inplace
+
+This puts a compiled main.*.so next to main.py; run it with
+`python -c "import main; main.main()"` (`python main.py` always runs
+the plain source).
+"""
+from setuptools import setup
+from mypyc.build import mypycify
+
+setup(
+    name="attestatsiya-parser",
+    py_modules=["main"],
+    ext_modules=mypycify(["--ignore-missing-imports", "main.py"]),
+)